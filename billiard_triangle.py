@@ -17,10 +17,13 @@ import random
 from pygame.locals import *
 
 # ゲーム設定の定数
-SCREEN_WIDTH = 800      # 画面の幅
-SCREEN_HEIGHT = 690     # 画面の高さ（UIエリア含む）
-BOARD_HEIGHT = 600      # 盤面の高さ
-FPS = 60                # フレームレート
+SCREEN_WIDTH = 800        # 画面の幅
+SCREEN_HEIGHT = 690       # 画面の高さ（UIエリア含む）
+BOARD_HEIGHT = 600        # 盤面の高さ
+FPS = 60                  # フレームレート
+PHYSICS_DT = 1 / FPS      # 物理演算の1ステップの時間（秒）。球の速度はこの1ステップあたりの移動量
+MAX_FRAME_TIME = 1 / 30   # 1フレームで進める物理演算の時間の上限（秒）
+TIMESTEP_EPSILON = 0.002  # 経過時間の誤差として無視する時間（秒）。clock.tick はミリ秒単位で、60FPSでも15〜17msにぶれる
 
 # 球の設定
 BALL_RADIUS = 15                        # 球の半径
@@ -41,6 +44,17 @@ MIN_VELOCITY = 0.1      # 停止判定の閾値
 INITIAL_SPEED = 22.0    # 球の初速
 RESTITUTION = 0.6       # 反発係数（1が完全弾性衝突）
 WALL_RESTITUTION = 0.8  # 壁での反発係数
+GRID_MIN_BALLS = 9      # この数以上の球ではグリッドで衝突候補を絞り込む（球を増やした構成向け）
+
+# 物理計算で使う派生定数（毎フレームの再計算を避ける）
+BALL_DIAMETER = BALL_RADIUS * 2                     # 球の直径（衝突距離）
+BALL_DIAMETER_SQ = BALL_DIAMETER ** 2               # 衝突距離の2乗
+MIN_VELOCITY_SQ = MIN_VELOCITY ** 2                 # 停止判定の閾値の2乗
+BALL_MIN_X = BALL_RADIUS                            # 球の中心が取りうるX座標の最小値
+BALL_MAX_X = SCREEN_WIDTH - BALL_RADIUS             # 球の中心が取りうるX座標の最大値
+BALL_MIN_Y = BALL_RADIUS                            # 球の中心が取りうるY座標の最小値
+BALL_MAX_Y = BOARD_HEIGHT - BALL_RADIUS             # 球の中心が取りうるY座標の最大値
+IMPULSE_FACTOR = 1 + RESTITUTION                    # 衝突時の力積の係数
 
 
 class Ball:
@@ -48,7 +62,10 @@ class Ball:
     ビリヤード球のクラス
     位置、速度、色などの属性と、移動や衝突などの機能を持つ
     """
-    def __init__(self, x, y, color, is_target=False):
+    # 属性を固定して属性アクセスを高速化（__dict__ を持たない）
+    __slots__ = ("x", "y", "vx", "vy", "color", "is_target", "moving", "on_moving_changed")
+    
+    def __init__(self, x, y, color, is_target=False, on_moving_changed=None):
         """
         球の初期化
         
@@ -57,6 +74,7 @@ class Ball:
             y (float): Y座標
             color (tuple): 球の色 (R,G,B)
             is_target (bool): 的球かどうか
+            on_moving_changed (callable): 移動状態が変わったときに新しい状態を渡して呼ぶ関数
         """
         self.x = x
         self.y = y
@@ -65,38 +83,62 @@ class Ball:
         self.color = color
         self.is_target = is_target
         self.moving = False
+        self.on_moving_changed = on_moving_changed
+    
+    def set_moving(self, moving):
+        """
+        移動状態を設定し、変化があれば通知する
+        
+        Args:
+            moving (bool): 移動中かどうか
+        """
+        if self.moving == moving:
+            return
+        
+        self.moving = moving
+        if self.on_moving_changed:
+            self.on_moving_changed(moving)
     
     def update(self):
         """球の位置と速度を更新する"""
-        if self.moving:
-            # 位置の更新
-            self.x += self.vx
-            self.y += self.vy
-            
-            # 壁との衝突判定と跳ね返り
-            if self.x - BALL_RADIUS < 0:
-                self.x = BALL_RADIUS
-                self.vx = -self.vx * WALL_RESTITUTION
-            elif self.x + BALL_RADIUS > SCREEN_WIDTH:
-                self.x = SCREEN_WIDTH - BALL_RADIUS
-                self.vx = -self.vx * WALL_RESTITUTION
-            
-            if self.y - BALL_RADIUS < 0:
-                self.y = BALL_RADIUS
-                self.vy = -self.vy * WALL_RESTITUTION
-            elif self.y + BALL_RADIUS > BOARD_HEIGHT:
-                self.y = BOARD_HEIGHT - BALL_RADIUS
-                self.vy = -self.vy * WALL_RESTITUTION
-            
-            # 摩擦による減速
-            self.vx *= FRICTION
-            self.vy *= FRICTION
-            
-            # 速度が小さくなったら停止
-            if math.sqrt(self.vx**2 + self.vy**2) < MIN_VELOCITY:
-                self.vx = 0
-                self.vy = 0
-                self.moving = False
+        if not self.moving:
+            return
+        
+        # 属性をローカル変数に読み出して計算（属性アクセスを減らす）
+        x = self.x + self.vx
+        y = self.y + self.vy
+        vx = self.vx
+        vy = self.vy
+        
+        # 壁との衝突判定と跳ね返り
+        if x < BALL_MIN_X:
+            x = BALL_MIN_X
+            vx = -vx * WALL_RESTITUTION
+        elif x > BALL_MAX_X:
+            x = BALL_MAX_X
+            vx = -vx * WALL_RESTITUTION
+        
+        if y < BALL_MIN_Y:
+            y = BALL_MIN_Y
+            vy = -vy * WALL_RESTITUTION
+        elif y > BALL_MAX_Y:
+            y = BALL_MAX_Y
+            vy = -vy * WALL_RESTITUTION
+        
+        # 摩擦による減速
+        vx *= FRICTION
+        vy *= FRICTION
+        
+        # 速度が小さくなったら停止
+        if vx * vx + vy * vy < MIN_VELOCITY_SQ:
+            vx = 0
+            vy = 0
+            self.set_moving(False)
+        
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
     
     def move_towards(self, target_x, target_y, speed=INITIAL_SPEED):
         """
@@ -114,7 +156,7 @@ class Ball:
         if distance > 0:
             self.vx = (dx / distance) * speed
             self.vy = (dy / distance) * speed
-            self.moving = True
+            self.set_moving(True)
     
     def collide_with(self, other_ball):
         """
@@ -128,12 +170,18 @@ class Ball:
         """
         dx = other_ball.x - self.x
         dy = other_ball.y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
         
-        # 衝突判定
-        if distance < BALL_RADIUS * 2:
+        # 外接矩形が重ならない組は距離を計算せずに除外
+        if abs(dx) >= BALL_DIAMETER or abs(dy) >= BALL_DIAMETER:
+            return False
+        
+        # 衝突判定（平方根を取らずに距離の2乗で比較）
+        distance_sq = dx * dx + dy * dy
+        if distance_sq < BALL_DIAMETER_SQ:
+            distance = math.sqrt(distance_sq)
+            
             # 衝突位置を調整（めり込み防止）
-            overlap = BALL_RADIUS * 2 - distance
+            overlap = BALL_DIAMETER - distance
             if distance > 0:  # ゼロ除算防止
                 self.x -= (dx / distance) * (overlap / 2)
                 self.y -= (dy / distance) * (overlap / 2)
@@ -154,7 +202,7 @@ class Ball:
                 dot_product = dvx * nx + dvy * ny
                 
                 # 衝突による速度変化
-                impulse = (1 + RESTITUTION) * dot_product
+                impulse = IMPULSE_FACTOR * dot_product
                 
                 # 速度の更新
                 self.vx += impulse * nx
@@ -163,8 +211,8 @@ class Ball:
                 other_ball.vy -= impulse * ny
                 
                 # 両方のボールを動かす
-                self.moving = True
-                other_ball.moving = True
+                self.set_moving(True)
+                other_ball.set_moving(True)
                 
                 # 完全に同じ軸上にある場合、わずかにランダムな力を加える（無限ループ防止）
                 if abs(dx) < 0.001 or abs(dy) < 0.001:
@@ -179,14 +227,54 @@ class Ball:
         
         return False
     
-    def draw(self, screen):
+    def draw(self, screen, surface):
         """
         球を画面に描画する
         
         Args:
             screen: 描画対象の画面
+            surface: 事前に描画済みの球のサーフェス
+            
+        Returns:
+            pygame.Rect: 描画した範囲
         """
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), BALL_RADIUS)
+        return screen.blit(surface, (int(self.x) - BALL_RADIUS, int(self.y) - BALL_RADIUS))
+
+
+def find_collision_pairs(balls):
+    """
+    衝突する可能性のある球の組を列挙する
+    球が少ないときはすべての組を返し、多いときは一様グリッドで近くの組だけに絞り込む
+    球を増やした構成のためのもので、的球と手球2つの通常のゲームでは使われない
+    
+    Args:
+        balls (list): 球のリスト
+        
+    Returns:
+        list: 球のインデックスの組 (i, j)（i < j）のリスト
+    """
+    n = len(balls)
+    if n < GRID_MIN_BALLS:
+        return [(i, j) for i in range(n) for j in range(i + 1, n)]
+    
+    # 直径を一辺とするセルに球を振り分ける（衝突する球は隣接するセルに入る）
+    grid = {}
+    cells = []
+    for i, ball in enumerate(balls):
+        cell = (int(ball.x // BALL_DIAMETER), int(ball.y // BALL_DIAMETER))
+        cells.append(cell)
+        grid.setdefault(cell, []).append(i)
+    
+    # 周囲3x3のセルに入っている球とだけ組にする
+    pairs = []
+    for i, (cx, cy) in enumerate(cells):
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for j in grid.get((gx, gy), ()):
+                    if j > i:
+                        pairs.append((i, j))
+    
+    return pairs
 
 
 class BilliardTriangleGame:
@@ -199,12 +287,45 @@ class BilliardTriangleGame:
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Billiard Triangle Game")
+        
+        # 処理するイベントだけをキューに入れる
+        # （マウス位置は毎フレーム取得するので MOUSEMOTION も受け取らない）
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([QUIT, KEYDOWN, MOUSEBUTTONDOWN, MOUSEBUTTONUP, VIDEOEXPOSE])
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, FONT_SIZE)
         
+        # 背景（盤面・UI部分・区切り線）を一度だけ描画しておく
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.background.fill(UI_BG_COLOR)
+        pygame.draw.rect(self.background, BG_COLOR, (0, 0, SCREEN_WIDTH, BOARD_HEIGHT))
+        pygame.draw.line(self.background, TEXT_COLOR, (0, BOARD_HEIGHT), (SCREEN_WIDTH, BOARD_HEIGHT), 2)
+        
+        # 前フレームで描画した範囲（最初のフレームは画面全体を描画する）
+        self.dirty_rects = [self.screen.get_rect()]
+        
         # カーソル用の半透明の球のサーフェスを作成
-        self.cursor_ball_surface = pygame.Surface((BALL_RADIUS*2, BALL_RADIUS*2), pygame.SRCALPHA)
-        pygame.draw.circle(self.cursor_ball_surface, (255, 255, 255, 128), (BALL_RADIUS, BALL_RADIUS), BALL_RADIUS)
+        self.cursor_ball_surface = self._create_ball_surface((255, 255, 255, 128))
+        
+        # 球の色ごとのサーフェスを作成（毎フレームの円の描画を避ける）
+        self.ball_surfaces = {
+            TARGET_BALL_COLOR: self._create_ball_surface(TARGET_BALL_COLOR),
+            PLAYER_BALL_COLOR: self._create_ball_surface(PLAYER_BALL_COLOR),
+        }
+        
+        # 固定のテキストは一度だけ描画しておく
+        board_center = (SCREEN_WIDTH // 2, BOARD_HEIGHT // 2)
+        self.game_over_text = self.font.render("Press R to play again", True, INSTRUCTION_COLOR).convert_alpha()
+        self.game_over_text_rect = self.game_over_text.get_rect(center=board_center)
+        self.help_text = self.font.render("Click to place a ball", True, INSTRUCTION_COLOR).convert_alpha()
+        self.help_text_rect = self.help_text.get_rect(center=board_center)
+        
+        # スコア表示のテキストのキャッシュ（最後に描画した値とサーフェスの組）
+        self.score_text_cache = None
+        self.best_score_text_cache = None
+        
+        # 前フレームのマウス位置
+        self.mouse_pos = None
         
         # ベストスコアの初期化
         self.best_score = 0
@@ -212,12 +333,43 @@ class BilliardTriangleGame:
         # ゲーム状態
         self.reset_game()
     
+    def _create_ball_surface(self, color):
+        """
+        球を描画済みのサーフェスを作成する
+        
+        Args:
+            color (tuple): 球の色 (R,G,B) または (R,G,B,A)
+            
+        Returns:
+            pygame.Surface: 球を描画したサーフェス
+        """
+        surface = pygame.Surface((BALL_RADIUS*2, BALL_RADIUS*2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (BALL_RADIUS, BALL_RADIUS), BALL_RADIUS)
+        # 画面と同じピクセル形式に変換しておく（描画時の変換を省く）
+        return surface.convert_alpha()
+    
+    def _render_score_text(self, cache, label, score):
+        """
+        スコア表示のテキストを描画する（値が変わったときのみ描画し直す）
+        
+        Args:
+            cache (tuple): 最後に描画した値とサーフェスの組（未描画ならNone）
+            label (str): スコアの見出し
+            score (int): 表示するスコア
+            
+        Returns:
+            tuple: 表示する値とテキストを描画したサーフェスの組
+        """
+        if cache is not None and cache[0] == score:
+            return cache
+        return score, self.font.render(f"{label}: {score}", True, TEXT_COLOR).convert_alpha()
+    
     def reset_game(self):
         """ゲームをリセットし、新しいゲームを開始する"""
         # ターゲット球の初期化（ランダムな位置）
         target_x = random.randint(BALL_RADIUS * 2, SCREEN_WIDTH - BALL_RADIUS * 2)
         target_y = random.randint(BALL_RADIUS * 2, BOARD_HEIGHT - BALL_RADIUS * 2)
-        self.target_ball = Ball(target_x, target_y, TARGET_BALL_COLOR, True)
+        self.target_ball = Ball(target_x, target_y, TARGET_BALL_COLOR, True, self._on_ball_moving_changed)
         
         # プレイヤーの球
         self.player_balls = []
@@ -225,13 +377,18 @@ class BilliardTriangleGame:
         
         # ゲーム状態
         self.placing_ball = False  # 球を配置中かどうか
-        self.all_balls_stopped = True  # すべての球が停止しているかどうか
+        self.moving_count = 0  # 移動中の球の数
         self.game_over = False
         self.current_score = 0
         self.triangle = None
+        self.triangle_surface = None  # 三角形を描画済みのサーフェス（ゲーム終了時に作成）
+        self.triangle_rect = None     # 三角形を囲む範囲
         
         # 一時的な球（配置プレビュー用）
         self.temp_ball = None
+        
+        # 画面の再描画が必要かどうか
+        self.needs_redraw = True
     
     def all_stopped(self):
         """
@@ -240,28 +397,82 @@ class BilliardTriangleGame:
         Returns:
             bool: すべての球が停止していればTrue
         """
-        if self.target_ball.moving:
-            return False
+        return self.moving_count == 0
+    
+    def _on_ball_moving_changed(self, moving):
+        """
+        球の移動状態が変わったときに移動中の球の数を更新する
         
-        for ball in self.player_balls:
-            if ball.moving:
-                return False
+        Args:
+            moving (bool): 球が動き出したならTrue、停止したならFalse
+        """
+        if moving:
+            self.moving_count += 1
+        else:
+            self.moving_count -= 1
+    
+    def _overlaps(self, x, y):
+        """
+        指定した位置に球を置いた場合に既存の球と重なるかチェック
         
-        return True
+        Args:
+            x (float): X座標
+            y (float): Y座標
+            
+        Returns:
+            bool: いずれかの球と重なればTrue
+        """
+        for ball in [self.target_ball] + self.player_balls:
+            dx = x - ball.x
+            dy = y - ball.y
+            if dx * dx + dy * dy < BALL_DIAMETER_SQ:
+                return True
+        
+        return False
     
     def update_balls(self):
         """すべての球の位置と速度を更新し、衝突判定を行う"""
+        balls = self.player_balls
+        n = len(balls)
+        if n + 1 >= GRID_MIN_BALLS:
+            self._update_many_balls()
+            return
+        
+        if n == 2:
+            # 的球と手球2つがそろった通常の構成では、下のループを展開して3組を直接判定する
+            target_ball = self.target_ball
+            ball1, ball2 = balls
+            target_ball.update()
+            ball1.update()
+            ball1.collide_with(target_ball)
+            ball1.collide_with(ball2)
+            ball2.update()
+            ball2.collide_with(target_ball)
+            return
+        
         self.target_ball.update()
         
-        for ball in self.player_balls:
-            ball.update()
+        for i in range(n):
+            balls[i].update()
             
-            # 他の球との衝突チェック
-            ball.collide_with(self.target_ball)
+            # 他の球との衝突チェック（各組は一度だけ判定する）
+            balls[i].collide_with(self.target_ball)
             
-            for other_ball in self.player_balls:
-                if ball != other_ball:
-                    ball.collide_with(other_ball)
+            for j in range(i + 1, n):
+                balls[i].collide_with(balls[j])
+    
+    def _update_many_balls(self):
+        """
+        球を増やした構成向けに、すべての球の位置と速度を更新し、衝突判定を行う
+        （通常のゲームは最大3球なので使われない）
+        すべての球を動かしてから、グリッドで絞り込んだ組だけを判定する
+        """
+        balls = [self.target_ball] + self.player_balls
+        for ball in balls:
+            ball.update()
+        
+        for i, j in find_collision_pairs(balls):
+            balls[i].collide_with(balls[j])
     
     def calculate_triangle_area(self):
         """
@@ -277,25 +488,30 @@ class BilliardTriangleGame:
         p2 = (self.player_balls[0].x, self.player_balls[0].y)
         p3 = (self.player_balls[1].x, self.player_balls[1].y)
         
-        # 三角形の面積を計算（ヘロンの公式）
-        a = math.sqrt((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)
-        b = math.sqrt((p3[0] - p2[0])**2 + (p3[1] - p2[1])**2)
-        c = math.sqrt((p1[0] - p3[0])**2 + (p1[1] - p3[1])**2)
-        s = (a + b + c) / 2
-        
-        # 面積計算の前に三角形が成立するか確認
-        if s > 0 and s > a and s > b and s > c:
-            area = math.sqrt(s * (s-a) * (s-b) * (s-c))
-            self.triangle = [p1, p2, p3]
-            return area
-        
-        return 0
+        # 三角形の面積を計算（外積による座標公式。一直線上に並ぶ場合は0になる）
+        area = abs((p2[0] - p1[0]) * (p3[1] - p1[1]) - (p3[0] - p1[0]) * (p2[1] - p1[1])) / 2
+        self.triangle = [p1, p2, p3]
+        return area
+    
+    def _create_triangle_surface(self):
+        """ゲーム終了時に表示する半透明の三角形のサーフェスを作成する"""
+        if not self.triangle:
+            return
+        
+        surface = pygame.Surface((SCREEN_WIDTH, BOARD_HEIGHT), pygame.SRCALPHA)
+        self.triangle_rect = pygame.draw.polygon(surface, TRIANGLE_COLOR, self.triangle)
+        self.triangle_surface = surface.convert_alpha()
     
     def run(self):
         """ゲームのメインループ"""
         running = True
+        accumulator = 0.0  # まだ物理演算に反映していない経過時間（秒）
         
         while running:
+            # フレームレートの制限と経過時間の取得
+            # （処理落ちしても一度に大きく進めないよう上限で切り詰める）
+            frame_time = min(self.clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
+            
             # イベント処理
             for event in pygame.event.get():
                 if event.type == QUIT:
@@ -313,20 +529,14 @@ class BilliardTriangleGame:
                         mouse_pos = pygame.mouse.get_pos()
                         if mouse_pos[1] <= BOARD_HEIGHT:
                             # 他の球と重ならないかチェック
-                            can_place = True
-                            if math.sqrt((mouse_pos[0] - self.target_ball.x)**2 + (mouse_pos[1] - self.target_ball.y)**2) < BALL_RADIUS * 2:
-                                can_place = False
-                            
-                            for ball in self.player_balls:
-                                if math.sqrt((mouse_pos[0] - ball.x)**2 + (mouse_pos[1] - ball.y)**2) < BALL_RADIUS * 2:
-                                    can_place = False
-                            
-                            if can_place:
+                            if not self._overlaps(mouse_pos[0], mouse_pos[1]):
                                 # 球を配置
-                                new_ball = Ball(mouse_pos[0], mouse_pos[1], PLAYER_BALL_COLOR)
+                                new_ball = Ball(mouse_pos[0], mouse_pos[1], PLAYER_BALL_COLOR,
+                                                on_moving_changed=self._on_ball_moving_changed)
                                 self.placing_ball = True
                                 self.player_balls.append(new_ball)
                                 self.balls_left -= 1
+                                self.needs_redraw = True
                 
                 elif event.type == MOUSEBUTTONUP:
                     if event.button == 1 and self.placing_ball:
@@ -337,101 +547,116 @@ class BilliardTriangleGame:
                             # 色が変わる問題を修正するため、明示的に色を設定
                             last_ball.color = PLAYER_BALL_COLOR
                             last_ball.move_towards(self.target_ball.x, self.target_ball.y)
-                            self.all_balls_stopped = False
+                            self.needs_redraw = True
                 
-                elif event.type == MOUSEMOTION:
-                    # マウスの位置に応じて一時的な球の位置を更新
-                    mouse_pos = pygame.mouse.get_pos()
-                    if mouse_pos[1] <= BOARD_HEIGHT and self.all_stopped() and self.balls_left > 0 and not self.game_over:
-                        # 他の球と重ならないかチェック
-                        can_place = True
-                        if math.sqrt((mouse_pos[0] - self.target_ball.x)**2 + (mouse_pos[1] - self.target_ball.y)**2) < BALL_RADIUS * 2:
-                            can_place = False
-                        
-                        for ball in self.player_balls:
-                            if math.sqrt((mouse_pos[0] - ball.x)**2 + (mouse_pos[1] - ball.y)**2) < BALL_RADIUS * 2:
-                                can_place = False
-                        
-                        # 一時的な球を更新（マウス位置に直接設定）
-                        if can_place:
-                            self.temp_ball = True
-                        else:
-                            self.temp_ball = None
+                elif event.type == VIDEOEXPOSE:
+                    # ウィンドウが再表示されたら、描画済みの画面全体を反映し直す
+                    pygame.display.flip()
             
-            # 球の更新
-            if not self.all_balls_stopped:
-                self.update_balls()
-                self.all_balls_stopped = self.all_stopped()
+            # マウスの位置に応じて一時的な球の位置を更新
+            # （移動イベントごとではなく、1フレームに1回だけ最新の位置で判定する）
+            mouse_pos = pygame.mouse.get_pos()
+            if mouse_pos != self.mouse_pos:
+                self.mouse_pos = mouse_pos
+                # プレビューはマウスに追従するので再描画する
+                self.needs_redraw = True
+                
+                if mouse_pos[1] <= BOARD_HEIGHT and self.all_stopped() and self.balls_left > 0 and not self.game_over:
+                    # 一時的な球を更新（他の球と重ならない場合のみ表示）
+                    if not self._overlaps(mouse_pos[0], mouse_pos[1]):
+                        self.temp_ball = True
+                    else:
+                        self.temp_ball = None
+            
+            # 球の更新（描画のフレームレートとは独立した固定の時間刻みで進める）
+            if not self.all_stopped():
+                accumulator += frame_time
+                while accumulator >= PHYSICS_DT - TIMESTEP_EPSILON and not self.all_stopped():
+                    self.update_balls()
+                    accumulator -= PHYSICS_DT
+                    self.needs_redraw = True
+                    
+                    # ミリ秒単位の経過時間と1ステップの僅かな差は切り捨てる
+                    # （残すと一部のフレームで物理演算が進まず、動きがカクつく）
+                    if abs(accumulator) < TIMESTEP_EPSILON:
+                        accumulator = 0.0
                 
                 # すべての球が停止したら次のステップへ
-                if self.all_balls_stopped:
+                if self.all_stopped():
+                    accumulator = 0.0
                     if self.balls_left == 0:
                         # ゲーム終了、スコア計算
                         self.current_score = self.calculate_triangle_area()
                         if self.current_score > self.best_score:
                             self.best_score = self.current_score
                         self.game_over = True
+                        self._create_triangle_surface()
             
-            # 描画処理
-            self._draw_game()
-            
-            # フレームレートの制限
-            self.clock.tick(FPS)
+            # 描画処理（状態が変わったときのみ）
+            if self.needs_redraw:
+                self._draw_game()
+                self.needs_redraw = False
         
         pygame.quit()
         sys.exit()
     
     def _draw_game(self):
         """ゲーム画面の描画"""
-        # 背景の描画
-        self.screen.fill(UI_BG_COLOR)
-        pygame.draw.rect(self.screen, BG_COLOR, (0, 0, SCREEN_WIDTH, BOARD_HEIGHT))
-        pygame.draw.line(self.screen, TEXT_COLOR, (0, BOARD_HEIGHT), (SCREEN_WIDTH, BOARD_HEIGHT), 2)
+        # 前フレームで描画した範囲を背景で消去
+        for rect in self.dirty_rects:
+            self.screen.blit(self.background, rect, rect)
+        
+        # 今フレームで描画した範囲
+        drawn_rects = []
         
         # 三角形の描画
-        if self.game_over and self.triangle:
-            triangle_surface = pygame.Surface((SCREEN_WIDTH, BOARD_HEIGHT), pygame.SRCALPHA)
-            pygame.draw.polygon(triangle_surface, TRIANGLE_COLOR, self.triangle)
-            self.screen.blit(triangle_surface, (0, 0))
+        if self.game_over and self.triangle_surface is not None:
+            # 三角形を囲む範囲だけを転送する
+            drawn_rects.append(self.screen.blit(self.triangle_surface, self.triangle_rect, self.triangle_rect))
         
         # すべての球を描画
-        self.target_ball.draw(self.screen)
+        drawn_rects.append(self.target_ball.draw(self.screen, self.ball_surfaces[self.target_ball.color]))
         for ball in self.player_balls:
-            ball.draw(self.screen)
+            drawn_rects.append(ball.draw(self.screen, self.ball_surfaces[ball.color]))
         
         # 一時的な球（プレビュー）を描画
-        if self.temp_ball and not self.placing_ball and self.all_balls_stopped and self.balls_left > 0:
-            # マウスの現在位置を取得して、そこに半透明の球を描画
-            mouse_pos = pygame.mouse.get_pos()
+        if self.temp_ball and not self.placing_ball and self.all_stopped() and self.balls_left > 0:
+            # マウスの現在位置に半透明の球を描画
+            mouse_pos = self.mouse_pos
             if mouse_pos[1] <= BOARD_HEIGHT:
-                self.screen.blit(self.cursor_ball_surface, (mouse_pos[0] - BALL_RADIUS, mouse_pos[1] - BALL_RADIUS))
+                drawn_rects.append(self.screen.blit(self.cursor_ball_surface, (mouse_pos[0] - BALL_RADIUS, mouse_pos[1] - BALL_RADIUS)))
         
         # 情報表示
-        self._draw_ui()
+        drawn_rects.extend(self._draw_ui())
         
-        # 画面の更新
-        pygame.display.flip()
+        # 画面の更新（前フレームと今フレームで描画した範囲のみ）
+        pygame.display.update(self.dirty_rects + drawn_rects)
+        self.dirty_rects = drawn_rects
     
     def _draw_ui(self):
-        """UI部分の描画"""
+        """
+        UI部分の描画
+        
+        Returns:
+            list: 描画した範囲（pygame.Rect）のリスト
+        """
         info_y = BOARD_HEIGHT + 15
+        drawn_rects = []
         
         # スコア表示
-        score_text = self.font.render(f"Score: {int(self.current_score)}", True, TEXT_COLOR)
-        self.screen.blit(score_text, (20, info_y))
+        self.score_text_cache = self._render_score_text(self.score_text_cache, "Score", int(self.current_score))
+        drawn_rects.append(self.screen.blit(self.score_text_cache[1], (20, info_y)))
         
-        best_score_text = self.font.render(f"Best: {int(self.best_score)}", True, TEXT_COLOR)
-        self.screen.blit(best_score_text, (20, info_y + 35))
+        self.best_score_text_cache = self._render_score_text(self.best_score_text_cache, "Best", int(self.best_score))
+        drawn_rects.append(self.screen.blit(self.best_score_text_cache[1], (20, info_y + 35)))
         
         # ゲームステータスのテキスト
         if self.game_over:
-            game_over_text = self.font.render("Press R to play again", True, INSTRUCTION_COLOR)
-            text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, BOARD_HEIGHT // 2))
-            self.screen.blit(game_over_text, text_rect)
-        elif not self.game_over and self.all_balls_stopped and self.balls_left > 0:
-            help_text = self.font.render("Click to place a ball", True, INSTRUCTION_COLOR)
-            text_rect = help_text.get_rect(center=(SCREEN_WIDTH // 2, BOARD_HEIGHT // 2))
-            self.screen.blit(help_text, text_rect)
+            drawn_rects.append(self.screen.blit(self.game_over_text, self.game_over_text_rect))
+        elif not self.game_over and self.all_stopped() and self.balls_left > 0:
+            drawn_rects.append(self.screen.blit(self.help_text, self.help_text_rect))
+        
+        return drawn_rects
 
 
 if __name__ == "__main__":